@@ -8,21 +8,48 @@ Automated CLI tool to add a new GIF entry.
 4. Appends the entry to gifs/index.json.
 5. Stages the new GIF and the updated manifest for commit.
 """
-import json
+import orjson
+from json_io import loads_mapped
 import sys
+import functools
+import bisect
 import argparse
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Set, Callable, Tuple
+from dataclasses import dataclass, field
 from pathlib import Path
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import jsonschema
+import fastjsonschema
+from validate_manifest import ManifestValidator
 import subprocess
+import shlex
+import shutil
 import os
 
+try:
+    import pygit2
+    PYGIT2_ERRORS = (pygit2.GitError, KeyError, ValueError)
+except ImportError:  # libgit2 bindings are optional; fall back to the git CLI
+    pygit2 = None
+    PYGIT2_ERRORS = ()
+
 # --- Configuration ---
 GIFS_DIR = Path("gifs")
 MANIFEST_PATH = GIFS_DIR / "index.json"
 SCHEMA_PATH = Path("gif-schema.json")
 MAX_FILE_SIZE_MB = 5  # Enforce a reasonable size limit
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
+COPY_BUFFER_SIZE = 1 << 20  # 1 MiB buffers for streaming the download to disk
+
+# Shared session so the HEAD preflight and the GET (and any later downloads)
+# reuse one keep-alive connection instead of repeating the TCP/TLS handshake
+SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=3, backoff_factor=0.3))
+SESSION.mount('https://', _ADAPTER)
+SESSION.mount('http://', _ADAPTER)
 
 
 # --- Utility Functions ---
@@ -32,41 +59,99 @@ def load_json(path: Path) -> Any:
     if not path.exists():
         if path == MANIFEST_PATH:
             print(f"Creating empty manifest file at {path}...")
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=2)
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps([], option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
             return []
         print(f"Error: Required file not found: {path}")
         sys.exit(1)
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        with open(path, 'rb') as f:
+            return loads_mapped(f)
+    except orjson.JSONDecodeError as e:
         print(f"Error: Invalid JSON in {path}: {e}")
         sys.exit(1)
 
+def _sort_key(entry: Dict[str, Any]) -> str:
+    return entry['filename'].lower()
+
+@dataclass
+class Manifest:
+    """Manifest entries kept sorted by filename, plus a set of names for O(1) lookups."""
+    entries: List[Dict[str, Any]]
+    names: Set[str] = field(init=False)
+
+    def __post_init__(self):
+        self.names = {g['filename'] for g in self.entries}
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self.names
+
+    def insert(self, entry: Dict[str, Any]):
+        """Inserts the entry at its sorted position."""
+        bisect.insort(self.entries, entry, key=_sort_key)
+        self.names.add(entry['filename'])
+
+def load_manifest(path: Path) -> Manifest:
+    """Loads the manifest, sorting it if it was hand-edited out of order."""
+    entries = load_json(path)
+    entries.sort(key=_sort_key) # Linear when the file is already sorted
+    return Manifest(entries)
+
+class LimitedReader:
+    """File-like wrapper that fails once more than `limit` bytes have been read."""
+
+    def __init__(self, raw: Any, limit: int):
+        self._raw = raw
+        self._limit = limit
+        self._bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size)
+        self._bytes_read += len(chunk)
+        if self._bytes_read > self._limit:
+            raise ValueError(f"File size exceeds limit of {MAX_FILE_SIZE_MB}MB.")
+        return chunk
+
+def _check_headers(headers: Any):
+    """Rejects responses that are not GIFs or advertise a size over the limit."""
+    if 'image/gif' not in headers.get('Content-Type', '').lower():
+        raise ValueError(f"URL did not return a GIF (Content-Type: {headers.get('Content-Type')})")
+
+    content_length = int(headers.get('Content-Length', 0))
+    if content_length > MAX_FILE_SIZE_BYTES:
+        raise ValueError(f"File size exceeds limit of {MAX_FILE_SIZE_MB}MB.")
+
+def _preflight(url: str):
+    """Checks type and size with a HEAD request before any of the body is fetched."""
+    try:
+        head = SESSION.head(url, allow_redirects=True, timeout=10)
+    except requests.exceptions.RequestException:
+        return  # Advisory only: a failed HEAD leaves the checks to the GET
+    if not head.ok:
+        return  # Some CDNs refuse HEAD but serve GET; the GET checks still apply
+    _check_headers(head.headers)
+
 def download_gif(url: str, output_path: Path):
     """Downloads the GIF, checking file size and content type."""
     try:
+        _preflight(url)
         print(f"Downloading GIF from: {url}")
-        response = requests.get(url, stream=True, timeout=30)
+        response = SESSION.get(url, stream=True, timeout=30)
         response.raise_for_status()
 
-        # Basic content and size checks
-        if 'image/gif' not in response.headers.get('Content-Type', '').lower():
-            raise ValueError(f"URL did not return a GIF (Content-Type: {response.headers.get('Content-Type')})")
-        
-        content_length = int(response.headers.get('Content-Length', 0))
-        if content_length > MAX_FILE_SIZE_MB * 1024 * 1024:
-            raise ValueError(f"File size exceeds limit of {MAX_FILE_SIZE_MB}MB.")
+        # Basic content and size checks, in case the HEAD response differed
+        _check_headers(response.headers)
 
         GIFS_DIR.mkdir(exist_ok=True)
+        # Content-Length is advisory, so the reader enforces the limit on the actual bytes
+        response.raw.decode_content = True
         with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+            shutil.copyfileobj(LimitedReader(response.raw, MAX_FILE_SIZE_BYTES), f, length=COPY_BUFFER_SIZE)
         
         print(f"Successfully downloaded to {output_path}. Size: {output_path.stat().st_size / 1024:.2f} KB.")
-    except (requests.exceptions.RequestException, ValueError) as e:
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, ValueError) as e:
         print(f"Error during download: {e}")
+        if output_path.exists(): os.remove(output_path) # Clean up the partial download
         sys.exit(1)
 
 def get_metadata(filename: str) -> Dict[str, Any]:
@@ -94,13 +179,38 @@ def get_metadata(filename: str) -> Dict[str, Any]:
         "tags": tags
     }
 
+@functools.lru_cache(maxsize=1)
+def _compile_validator(schema_path: Path, mtime_ns: int) -> Tuple[Callable[[Any], Any], Any]:
+    """
+    Compiles the per-entry validators once for a given schema revision.
+
+    Returns the generated fastjsonschema function used on the hot path and the
+    jsonschema validator used only to build a detailed report on failure.
+    """
+    schema = load_json(schema_path)
+    cls = jsonschema.validators.validator_for(schema, default=jsonschema.Draft7Validator)
+    cls.check_schema(schema)
+    return fastjsonschema.compile(schema['items']), cls(schema['items'])
+
+def _get_validator() -> Tuple[Callable[[Any], Any], Any]:
+    """Returns the cached entry validators, recompiling if the schema changed."""
+    mtime_ns = SCHEMA_PATH.stat().st_mtime_ns if SCHEMA_PATH.exists() else 0
+    return _compile_validator(SCHEMA_PATH, mtime_ns)
+
 def validate_entry(entry: Dict[str, Any]):
     """Validates the new manifest entry against the schema."""
-    schema = load_json(SCHEMA_PATH)
+    fast_validate, validator = _get_validator()
     try:
-        jsonschema.validate(instance=[entry], schema={"type": "array", "items": schema['items']})
+        try:
+            fast_validate(entry)
+        except fastjsonschema.JsonSchemaException:
+            # Failure path only: let jsonschema pick the most relevant error to report
+            error = jsonschema.exceptions.best_match(validator.iter_errors(entry))
+            if error is None:
+                raise
+            raise error
         print("Metadata passed schema validation.")
-    except jsonschema.ValidationError as e:
+    except (jsonschema.ValidationError, fastjsonschema.JsonSchemaException) as e:
         print("\n--- METADATA VALIDATION FAILED ---")
         print(f"Error: {e.message}")
         print("Path:", " -> ".join(map(str, e.path)))
@@ -108,31 +218,64 @@ def validate_entry(entry: Dict[str, Any]):
         sys.exit(1)
 
 def update_manifest(entry: Dict[str, Any], manifest_path: Path):
-    """Appends the new entry to the manifest file."""
-    manifest = load_json(manifest_path)
+    """Inserts the new entry into the manifest file, keeping it sorted."""
+    manifest = load_manifest(manifest_path)
     # Check for duplicate filename
-    if any(g['filename'] == entry['filename'] for g in manifest):
+    if entry['filename'] in manifest:
         print(f"Error: Filename '{entry['filename']}' already exists in manifest. Aborting.")
         if Path(entry['filename']).exists(): os.remove(Path(entry['filename'])); # Clean up the downloaded file
         sys.exit(1)
-        
-    manifest.append(entry)
-    manifest.sort(key=lambda x: x['filename'].lower()) # Sort for consistency
 
-    with open(manifest_path, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2)
+    manifest.insert(entry)
+
+    with open(manifest_path, 'wb') as f:
+        f.write(orjson.dumps(manifest.entries, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
     print(f"Successfully updated and sorted manifest: {manifest_path}")
 
+def _run_manifest_hook(manifest_path: Path):
+    """Runs the pre-commit manifest schema check, which libgit2 commits would skip."""
+    if not ManifestValidator(str(SCHEMA_PATH), str(manifest_path)).check():
+        print("Manifest failed the pre-commit schema check; nothing was committed.")
+        sys.exit(1)
+
+def _commit_with_pygit2(paths: List[Path], commit_message: str):
+    """
+    Stages the paths and commits them in-process via libgit2.
+
+    libgit2 does not run git hooks, so callers must run the manifest check first.
+    """
+    repo_path = pygit2.discover_repository(os.getcwd())
+    if repo_path is None:
+        raise pygit2.GitError("Not a git repository (or any of the parent directories)")
+    repo = pygit2.Repository(repo_path)
+    workdir = Path(repo.workdir).resolve()
+
+    for path in paths:
+        repo.index.add(path.resolve().relative_to(workdir).as_posix())
+    repo.index.write()
+
+    tree = repo.index.write_tree()
+    author = repo.default_signature
+    parents = [] if repo.head_is_unborn else [repo.head.target]
+    repo.create_commit('HEAD', author, author, commit_message, tree, parents)
+
 def run_git_add_commit(gif_path: Path, manifest_path: Path):
     """Stages and commits the changes."""
     print("\n--- Staging Changes ---")
+    commit_message = f"Add new GIF: {gif_path.name}"
     try:
-        subprocess.run(['git', 'add', str(gif_path)], check=True, capture_output=True)
-        subprocess.run(['git', 'add', str(manifest_path)], check=True, capture_output=True)
-        
-        commit_message = f"Add new GIF: {gif_path.name}"
-        subprocess.run(['git', 'commit', '-m', commit_message], check=True, capture_output=True)
-        
+        if pygit2 is not None:
+            _run_manifest_hook(manifest_path)
+            _commit_with_pygit2([gif_path, manifest_path], commit_message)
+        else:
+            # Chain add/add/commit in a single shell to pay the process spawn cost once
+            subprocess.run(
+                f"git add {shlex.quote(str(gif_path))}"
+                f" && git add {shlex.quote(str(manifest_path))}"
+                f" && git commit -m {shlex.quote(commit_message)}",
+                shell=True, check=True, capture_output=True
+            )
+
         print("Success! GIF and manifest committed.")
         print(f"Next step: `git push` to publish.")
     except subprocess.CalledProcessError as e:
@@ -140,6 +283,10 @@ def run_git_add_commit(gif_path: Path, manifest_path: Path):
         print(e.stderr.decode())
         print("Ensure you have run 'git init' and configured your user identity.")
         sys.exit(1)
+    except PYGIT2_ERRORS as e:
+        print(f"Error during git commit: {e}")
+        print("Ensure you have run 'git init' and configured your user identity.")
+        sys.exit(1)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -8,11 +8,14 @@ This ensures that the repository contains all files listed in the index,
 allowing continuous integration/deployment (CI/CD) or GitHub Pages to track 
 the file paths even if the full GIF content is added later.
 """
-import json
+import orjson
+from json_io import loads_mapped
+import os
 import sys
 import argparse
 from typing import Any, Dict, List
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Constants ---
 
@@ -20,13 +23,16 @@ from pathlib import Path
 # This is used as the default placeholder content
 MINIMAL_GIF = b'GIF89a\x01\x00\x01\x00\x80\x00\x00\xff\xff\xff\x00\x00\x00!\xf9\x04\x01\x00\x00\x00\x00,\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;'
 
+# Placeholder writes are independent I/O-bound syscalls, so threads overlap them
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 
 def _load_manifest(path: Path) -> List[Dict[str, Any]]:
     """Loads and validates the GIF manifest JSON file."""
     print(f"Loading manifest from {path}...")
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            manifest = json.load(f)
+        with open(path, 'rb') as f:
+            manifest = loads_mapped(f)
             
         if not isinstance(manifest, list):
             print(f"Error: Expected JSON array (list) in {path}")
@@ -37,7 +43,7 @@ def _load_manifest(path: Path) -> List[Dict[str, Any]]:
     except FileNotFoundError:
         print(f"Error: Manifest file not found at {path}")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error: Invalid JSON format in {path}: {e}")
         sys.exit(1)
     except Exception as e:
@@ -60,23 +66,40 @@ class PlaceholderGenerator:
         """
         self.gif_dir = gif_dir
         self.write_minimal = write_minimal
+        # The inner loop joins plain strings to avoid a Path per entry
+        self._gif_dir_prefix = os.fspath(gif_dir) + os.sep
         # Ensure the output directory exists
         self.gif_dir.mkdir(parents=True, exist_ok=True)
+        # One directory listing up front instead of a stat() per manifest entry
+        with os.scandir(self.gif_dir) as entries:
+            self._existing = {e.name for e in entries}
         print(f"GIF directory set to: {self.gif_dir}")
 
-    def _write_placeholder(self, file_path: Path) -> None:
+    def _write_placeholder(self, file_path: str) -> None:
         """Writes the placeholder file content."""
         try:
-            if self.write_minimal:
-                with open(file_path, 'wb') as out:
-                    out.write(MINIMAL_GIF)
-            else:
-                # 'touch' equivalent: create empty file if it doesn't exist
-                file_path.touch(exist_ok=True)
+            # O_EXCL: one open per file that also refuses to clobber an existing GIF,
+            # and without the extra stat() that Path.touch performs
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            try:
+                if self.write_minimal:
+                    os.write(fd, MINIMAL_GIF)
+            finally:
+                os.close(fd)
         except Exception as e:
             print(f"Failed to create placeholder at {file_path}: {e}")
             raise
 
+    def _try_write_placeholder(self, filename: str) -> bool:
+        """Worker for generate(); returns whether the placeholder was created."""
+        try:
+            self._write_placeholder(self._gif_dir_prefix + filename)
+        except Exception:
+            # Error already printed in _write_placeholder, just continue
+            return False
+        print(f"Created placeholder: {filename}")
+        return True
+
     def generate(self, manifest_entries: List[Dict[str, Any]]) -> int:
         """
         Iterates through manifest entries and creates missing placeholder files.
@@ -86,27 +109,29 @@ class PlaceholderGenerator:
         """
         print("\n--- Starting GIF Placeholder Generation ---")
         created_count = 0
-        
-        for entry in manifest_entries:
-            filename = entry.get("filename")
-            
-            if not filename or not filename.endswith('.gif'):
-                print(f"Warning: Entry missing a valid 'filename'; skipping entry: {entry}")
-                continue
-                
-            path = self.gif_dir / filename
-            
-            if path.exists():
-                # print(f"Skipping (exists): {filename}") # Verbose logging removed for cleaner output
-                continue
 
-            try:
-                self._write_placeholder(path)
-                created_count += 1
-                print(f"Created placeholder: {filename}")
-            except Exception:
-                # Error already printed in _write_placeholder, just continue
-                continue
+        # Pull valid filenames out once, then diff against the directory listing
+        names = [
+            e["filename"] for e in manifest_entries
+            if isinstance(e.get("filename"), str) and e["filename"].endswith('.gif')
+        ]
+        if len(names) != len(manifest_entries):
+            rejected = [
+                e for e in manifest_entries
+                if not (isinstance(e.get("filename"), str) and e["filename"].endswith('.gif'))
+            ]
+            for entry in rejected:
+                print(f"Warning: Entry missing a valid 'filename'; skipping entry: {entry}")
+        # dict.fromkeys drops names listed twice, so every worker gets a unique path
+        missing = list(dict.fromkeys(n for n in names if n not in self._existing))
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                results = executor.map(self._try_write_placeholder, missing)
+                for filename, created in zip(missing, results):
+                    if created:
+                        self._existing.add(filename)
+                        created_count += 1
 
         print(f"\nFinished: Created {created_count} new placeholder file(s).")
         return created_count
@@ -0,0 +1,24 @@
+# json_io.py
+"""
+Shared JSON loading helper for the repository scripts (add_gif_cli.py,
+validate_manifest.py and generate_placeholders.py).
+"""
+import mmap
+import os
+from typing import Any, BinaryIO
+
+import orjson
+
+
+def loads_mapped(f: BinaryIO) -> Any:
+    """
+    Parses an open binary JSON file through a read-only mmap.
+
+    orjson reads straight from the mapping, so the file is never copied into an
+    intermediate bytes object. Empty files cannot be mapped; they are handed to
+    orjson directly and raise the usual orjson.JSONDecodeError.
+    """
+    if os.fstat(f.fileno()).st_size == 0:
+        return orjson.loads(b"")
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+        return orjson.loads(view)